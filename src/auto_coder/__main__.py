@@ -12,12 +12,11 @@ import argparse
 import logging
 import sys
 
-from .pipeline import run_pipeline
-from .markdown_processor import process_markdown
+_RULE = "=" * 60
 
 
-def main(argv: list[str] | None = None) -> int:
-    """Entry point for the CLI."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the CLI."""
     parser = argparse.ArgumentParser(
         prog="auto_coder",
         description="Self-evolving programming automation pipeline.",
@@ -64,14 +63,31 @@ def main(argv: list[str] | None = None) -> int:
              "Supports {issue_file} and {source_file} placeholders.  "
              "Example: copilot -p \"Fix issues described in {issue_file}\" --allow-all-tools",
     )
+    return parser
+
 
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for the CLI."""
+    parser = _build_parser()
     args = parser.parse_args(argv)
 
+    # Validate before configuring logging or importing any backend
+    task_description = args.task or args.task_flag
+    if not args.markdown_file and not task_description:
+        parser.error("A task description or --markdown file is required")
+
     level = logging.DEBUG if args.verbose else logging.INFO
-    logging.basicConfig(level=level, format="%(levelname)s: %(message)s")
+    if logging.getLogger().handlers:
+        # Logging was configured by the embedding application; leave its
+        # root logger alone and apply the verbosity to this package only.
+        logging.getLogger("auto_coder").setLevel(level)
+    else:
+        logging.basicConfig(level=level, format="%(levelname)s: %(message)s")
 
     # Markdown mode
     if args.markdown_file:
+        from .markdown_processor import process_markdown
+
         md_result = process_markdown(
             args.markdown_file,
             max_iterations=args.max_iterations,
@@ -81,9 +97,7 @@ def main(argv: list[str] | None = None) -> int:
         return 0 if md_result.failure_count == 0 else 1
 
     # Task mode
-    task_description = args.task or args.task_flag
-    if not task_description:
-        parser.error("A task description or --markdown file is required")
+    from .pipeline import run_pipeline
 
     result = run_pipeline(
         task_description=task_description,
@@ -98,46 +112,54 @@ def main(argv: list[str] | None = None) -> int:
 
 def _print_result(result):
     """Print a human-readable summary of the pipeline result."""
-    print("\n" + "=" * 60)
-    print("PIPELINE RESULT")
-    print("=" * 60)
-    print(f"Task: {result.task_description}")
-    print(f"Status: {'SUCCESS' if result.success else 'FAILED'}")
-    print(f"Iterations: {result.total_iterations}")
-    print()
-    print("--- Generated Code ---")
-    print(result.final_code)
+    lines = [
+        "",
+        _RULE,
+        "PIPELINE RESULT",
+        _RULE,
+        f"Task: {result.task_description}",
+        f"Status: {'SUCCESS' if result.success else 'FAILED'}",
+        f"Iterations: {result.total_iterations}",
+        "",
+        "--- Generated Code ---",
+        result.final_code,
+    ]
     if result.final_result and result.final_result.return_value is not None:
-        print(f"Return value: {result.final_result.return_value}")
+        lines.append(f"Return value: {result.final_result.return_value}")
     if not result.success and result.iterations:
         last = result.iterations[-1]
         if last.diagnosis:
-            print(f"\nLast error: {last.diagnosis.root_cause}")
-            print(f"Suggestion: {last.diagnosis.suggestion}")
-    print("=" * 60)
+            lines.append(f"\nLast error: {last.diagnosis.root_cause}")
+            lines.append(f"Suggestion: {last.diagnosis.suggestion}")
+    lines.append(_RULE)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def _print_markdown_result(md_result):
     """Print a human-readable summary of the Markdown processing result."""
-    print("\n" + "=" * 60)
-    print("MARKDOWN PROCESSING RESULT")
-    print("=" * 60)
-    print(f"File: {md_result.filepath}")
-    print(f"Total blocks: {md_result.total_blocks}")
-    print(f"Executed: {len(md_result.block_results)}")
-    print(f"Succeeded: {md_result.success_count}")
-    print(f"Failed: {md_result.failure_count}")
+    lines = [
+        "",
+        _RULE,
+        "MARKDOWN PROCESSING RESULT",
+        _RULE,
+        f"File: {md_result.filepath}",
+        f"Total blocks: {md_result.total_blocks}",
+        f"Executed: {len(md_result.block_results)}",
+        f"Succeeded: {md_result.success_count}",
+        f"Failed: {md_result.failure_count}",
+    ]
 
     for br in md_result.block_results:
         status = "SUCCESS" if br.success else "FAILED"
-        print(f"\n--- Block {br.block_index} [{status}] "
-              f"({br.iterations} iteration(s)) ---")
-        print(br.final_code)
+        lines.append(f"\n--- Block {br.block_index} [{status}] "
+                     f"({br.iterations} iteration(s)) ---")
+        lines.append(br.final_code)
         if not br.success and br.last_diagnosis:
-            print(f"  Error: {br.last_diagnosis.root_cause}")
-            print(f"  Suggestion: {br.last_diagnosis.suggestion}")
+            lines.append(f"  Error: {br.last_diagnosis.root_cause}")
+            lines.append(f"  Suggestion: {br.last_diagnosis.suggestion}")
 
-    print("=" * 60)
+    lines.append(_RULE)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -13,7 +13,7 @@ from typing import List
 from .understanding import TaskRequirements
 
 
-@dataclass
+@dataclass(slots=True)
 class SolutionDesign:
     """Blueprint for a code solution."""
 
@@ -34,9 +34,10 @@ def design_solution(requirements: TaskRequirements) -> SolutionDesign:
         A ``SolutionDesign`` describing the planned implementation.
     """
     function_name = requirements.function_name or "solution"
-    parameters = _derive_parameters(requirements)
-    return_type = _derive_return_type(requirements)
-    algorithm_steps = _derive_algorithm_steps(requirements)
+    desc_lower = requirements.description.lower()
+    parameters = _derive_parameters(desc_lower)
+    return_type = _derive_return_type(desc_lower)
+    algorithm_steps = _derive_algorithm_steps(desc_lower)
 
     return SolutionDesign(
         function_name=function_name,
@@ -47,79 +48,74 @@ def design_solution(requirements: TaskRequirements) -> SolutionDesign:
     )
 
 
-def _derive_parameters(requirements: TaskRequirements) -> List[str]:
-    """Derive function parameters from the requirements."""
-    desc_lower = requirements.description.lower()
-
-    # Ordered from most specific to least specific to avoid overlap
-    param_hints = [
-        ("two integers", ["a: int", "b: int"]),
-        ("two numbers", ["a: int", "b: int"]),
-        ("two strings", ["s1: str", "s2: str"]),
-        ("factorial", ["n: int"]),
-        ("fibonacci", ["n: int"]),
-        ("list", ["items: list"]),
-        ("array", ["arr: list"]),
-        ("string", ["s: str"]),
-        ("text", ["text: str"]),
-        ("number", ["n: int"]),
-        ("integer", ["n: int"]),
-        ("of n", ["n: int"]),
-        ("dictionary", ["data: dict"]),
-        ("dict", ["data: dict"]),
-    ]
-
-    for hint, params in param_hints:
+# Ordered from most specific to least specific to avoid overlap
+_PARAM_HINTS = (
+    ("two integers", ("a: int", "b: int")),
+    ("two numbers", ("a: int", "b: int")),
+    ("two strings", ("s1: str", "s2: str")),
+    ("factorial", ("n: int",)),
+    ("fibonacci", ("n: int",)),
+    ("list", ("items: list",)),
+    ("array", ("arr: list",)),
+    ("string", ("s: str",)),
+    ("text", ("text: str",)),
+    ("number", ("n: int",)),
+    ("integer", ("n: int",)),
+    ("of n", ("n: int",)),
+    ("dictionary", ("data: dict",)),
+    ("dict", ("data: dict",)),
+)
+
+_TYPE_HINTS = (
+    ("true or false", "bool"),
+    ("boolean", "bool"),
+    ("count", "int"),
+    ("number", "int"),
+    ("sum", "int"),
+    ("average", "float"),
+    ("mean", "float"),
+    ("list", "list"),
+    ("string", "str"),
+    ("sorted", "list"),
+    ("dictionary", "dict"),
+)
+
+_STEP_HINTS = (
+    (("sort",), "Sort the data"),
+    (("filter",), "Filter elements based on condition"),
+    (("sum", "add"), "Compute the sum"),
+    (("search", "find"), "Search for the target element"),
+    (("reverse",), "Reverse the data"),
+    (("count",), "Count matching elements"),
+    (("convert", "transform"), "Transform the data"),
+)
+
+
+def _derive_parameters(desc_lower: str) -> List[str]:
+    """Derive function parameters from the lower-cased task description."""
+    for hint, params in _PARAM_HINTS:
         if hint in desc_lower:
-            return params
+            return list(params)
 
     return ["data"]
 
 
-def _derive_return_type(requirements: TaskRequirements) -> str:
-    """Derive the return type from the requirements."""
-    desc_lower = requirements.description.lower()
-
-    type_hints = {
-        "true or false": "bool",
-        "boolean": "bool",
-        "count": "int",
-        "number": "int",
-        "sum": "int",
-        "average": "float",
-        "mean": "float",
-        "list": "list",
-        "string": "str",
-        "sorted": "list",
-        "dictionary": "dict",
-    }
-
-    for hint, rtype in type_hints.items():
+def _derive_return_type(desc_lower: str) -> str:
+    """Derive the return type from the lower-cased task description."""
+    for hint, rtype in _TYPE_HINTS:
         if hint in desc_lower:
             return rtype
 
     return "Any"
 
 
-def _derive_algorithm_steps(requirements: TaskRequirements) -> List[str]:
-    """Derive high-level algorithm steps from the requirements."""
+def _derive_algorithm_steps(desc_lower: str) -> List[str]:
+    """Derive high-level algorithm steps from the lower-cased task description."""
     steps = ["Validate inputs"]
 
-    desc_lower = requirements.description.lower()
-    if "sort" in desc_lower:
-        steps.append("Sort the data")
-    if "filter" in desc_lower:
-        steps.append("Filter elements based on condition")
-    if "sum" in desc_lower or "add" in desc_lower:
-        steps.append("Compute the sum")
-    if "search" in desc_lower or "find" in desc_lower:
-        steps.append("Search for the target element")
-    if "reverse" in desc_lower:
-        steps.append("Reverse the data")
-    if "count" in desc_lower:
-        steps.append("Count matching elements")
-    if "convert" in desc_lower or "transform" in desc_lower:
-        steps.append("Transform the data")
+    for keywords, step in _STEP_HINTS:
+        if any(kw in desc_lower for kw in keywords):
+            steps.append(step)
 
     steps.append("Return the result")
     return steps
@@ -8,12 +8,35 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 from .execution import ExecutionResult
 
-
-@dataclass
+_LINE_RE = re.compile(r"line (\d+)")
+_USER_FRAME_RE = re.compile(r"""File ["']<string>["'], line (\d+)""")
+_NAME_ERROR_RE = re.compile(r"name '(\w+)' is not defined")
+
+_ERROR_CATEGORIES = {
+    "SyntaxError": "syntax",
+    "IndentationError": "syntax",
+    "TabError": "syntax",
+    "NameError": "reference",
+    "AttributeError": "reference",
+    "TypeError": "type",
+    "ValueError": "value",
+    "IndexError": "index",
+    "KeyError": "key",
+    "ZeroDivisionError": "arithmetic",
+    "RecursionError": "recursion",
+    "ImportError": "import",
+    "ModuleNotFoundError": "import",
+    "FileNotFoundError": "io",
+    "IOError": "io",
+    "PermissionError": "io",
+}
+
+
+@dataclass(slots=True)
 class Diagnosis:
     """Diagnosis of a failed execution."""
 
@@ -53,8 +76,15 @@ def diagnose(result: ExecutionResult) -> Optional[Diagnosis]:
 
 
 def _extract_line_number(traceback_str: str) -> Optional[int]:
-    """Extract the line number from a traceback string."""
-    match = re.search(r'line (\d+)', traceback_str)
+    """Extract the line number from a traceback string.
+
+    The innermost frame of the executed code is preferred: the outer
+    frames belong to the sandbox itself, not to the code being repaired.
+    """
+    frames = _USER_FRAME_RE.findall(traceback_str)
+    if frames:
+        return int(frames[-1])
+    match = _LINE_RE.search(traceback_str)
     if match:
         return int(match.group(1))
     return None
@@ -62,73 +92,82 @@ def _extract_line_number(traceback_str: str) -> Optional[int]:
 
 def _categorize_error(error_type: str) -> str:
     """Categorize the error into a high-level category."""
-    categories = {
-        "SyntaxError": "syntax",
-        "IndentationError": "syntax",
-        "TabError": "syntax",
-        "NameError": "reference",
-        "AttributeError": "reference",
-        "TypeError": "type",
-        "ValueError": "value",
-        "IndexError": "index",
-        "KeyError": "key",
-        "ZeroDivisionError": "arithmetic",
-        "RecursionError": "recursion",
-        "ImportError": "import",
-        "ModuleNotFoundError": "import",
-        "FileNotFoundError": "io",
-        "IOError": "io",
-        "PermissionError": "io",
-    }
-    return categories.get(error_type, "runtime")
+    return _ERROR_CATEGORIES.get(error_type, "runtime")
 
 
 def _identify_root_cause(error_type: str, error_msg: str) -> str:
     """Identify the root cause of the error."""
-    if error_type == "NameError":
-        match = re.search(r"name '(\w+)' is not defined", error_msg)
-        if match:
-            return f"Variable or function '{match.group(1)}' is used but not defined"
-    elif error_type == "TypeError":
-        if "argument" in error_msg:
-            return "Function called with wrong number or type of arguments"
-        if "unsupported operand" in error_msg:
-            return "Operation applied to incompatible types"
-    elif error_type == "IndexError":
-        return "List index is out of the valid range"
-    elif error_type == "KeyError":
-        return "Dictionary key does not exist"
-    elif error_type == "ZeroDivisionError":
-        return "Division by zero encountered"
-    elif error_type == "SyntaxError":
-        return f"Syntax error in the code: {error_msg}"
-    elif error_type == "RecursionError":
-        return "Infinite recursion detected — missing or incorrect base case"
-    elif error_type == "ValueError":
-        return f"Invalid value: {error_msg}"
+    handler = _ROOT_CAUSE_HANDLERS.get(error_type)
+    if handler:
+        root_cause = handler(error_msg)
+        if root_cause:
+            return root_cause
 
     return f"{error_type}: {error_msg}"
 
 
 def _suggest_fix(error_type: str, error_msg: str) -> str:
     """Suggest a fix for the error."""
-    if error_type == "NameError":
-        match = re.search(r"name '(\w+)' is not defined", error_msg)
-        if match:
-            return f"Define '{match.group(1)}' before using it, or check for typos"
-    elif error_type == "TypeError":
-        if "argument" in error_msg:
-            return "Check function signature and ensure correct number of arguments"
-        return "Ensure operand types are compatible"
-    elif error_type == "IndexError":
-        return "Add bounds checking before accessing list elements"
-    elif error_type == "KeyError":
-        return "Use dict.get() or check key existence before access"
-    elif error_type == "ZeroDivisionError":
-        return "Add a check for zero before performing division"
-    elif error_type == "SyntaxError":
-        return "Review the code syntax near the reported line"
-    elif error_type == "RecursionError":
-        return "Add or fix the base case for recursion"
+    handler = _SUGGESTION_HANDLERS.get(error_type)
+    if handler:
+        suggestion = handler(error_msg)
+        if suggestion:
+            return suggestion
 
     return "Review the error message and fix the code accordingly"
+
+
+def _name_error_cause(error_msg: str) -> Optional[str]:
+    """Root cause for a ``NameError``."""
+    match = _NAME_ERROR_RE.search(error_msg)
+    if match:
+        return f"Variable or function '{match.group(1)}' is used but not defined"
+    return None
+
+
+def _type_error_cause(error_msg: str) -> Optional[str]:
+    """Root cause for a ``TypeError``."""
+    if "argument" in error_msg:
+        return "Function called with wrong number or type of arguments"
+    if "unsupported operand" in error_msg:
+        return "Operation applied to incompatible types"
+    return None
+
+
+def _name_error_suggestion(error_msg: str) -> Optional[str]:
+    """Suggested fix for a ``NameError``."""
+    match = _NAME_ERROR_RE.search(error_msg)
+    if match:
+        return f"Define '{match.group(1)}' before using it, or check for typos"
+    return None
+
+
+def _type_error_suggestion(error_msg: str) -> str:
+    """Suggested fix for a ``TypeError``."""
+    if "argument" in error_msg:
+        return "Check function signature and ensure correct number of arguments"
+    return "Ensure operand types are compatible"
+
+
+# Per-error-type handlers.  Each receives the error message and returns
+# a description, or ``None`` to fall back to the generic text.
+_ROOT_CAUSE_HANDLERS: Dict[str, Callable[[str], Optional[str]]] = {
+    "NameError": _name_error_cause,
+    "TypeError": _type_error_cause,
+    "IndexError": lambda msg: "List index is out of the valid range",
+    "KeyError": lambda msg: "Dictionary key does not exist",
+    "ZeroDivisionError": lambda msg: "Division by zero encountered",
+    "SyntaxError": lambda msg: f"Syntax error in the code: {msg}",
+    "RecursionError": lambda msg: "Infinite recursion detected — missing or incorrect base case",
+    "ValueError": lambda msg: f"Invalid value: {msg}",
+}
+
+_SUGGESTION_HANDLERS: Dict[str, Callable[[str], Optional[str]]] = {
+    "NameError": _name_error_suggestion,
+    "TypeError": _type_error_suggestion,
+    "IndexError": lambda msg: "Add bounds checking before accessing list elements",
+    "KeyError": lambda msg: "Use dict.get() or check key existence before access",
+    "ZeroDivisionError": lambda msg: "Add a check for zero before performing division",
+    "SyntaxError": lambda msg: "Review the code syntax near the reported line",
+    "RecursionError": lambda msg: "Add or fix the base case for recursion",
+}
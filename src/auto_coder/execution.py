@@ -8,10 +8,16 @@ from __future__ import annotations
 
 import traceback
 from dataclasses import dataclass, field
+from functools import lru_cache
+from types import CodeType, ModuleType
 from typing import Any, Dict, Optional
 
+# Only the innermost frames are kept: they locate the failure, while the
+# outer ones (deep recursion in particular) just inflate the result.
+MAX_TRACEBACK_FRAMES = 20
 
-@dataclass
+
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of executing generated code."""
 
@@ -42,23 +48,23 @@ def execute_code(source: str, test_call: Optional[str] = None) -> ExecutionResul
     namespace: Dict[str, Any] = {"__builtins__": __builtins__}
 
     try:
-        exec(source, namespace)  # noqa: S102
+        exec(_compile(source, "exec"), namespace)  # noqa: S102
     except Exception as exc:
         return ExecutionResult(
             success=False,
             error=str(exc),
             error_type=type(exc).__name__,
-            traceback_str=traceback.format_exc(),
-            namespace=namespace,
+            traceback_str=traceback.format_exc(limit=-MAX_TRACEBACK_FRAMES),
+            namespace=_user_names(namespace),
         )
 
     if test_call is not None:
         try:
-            result = eval(test_call, namespace)  # noqa: S307
+            result = eval(_compile(test_call, "eval"), namespace)  # noqa: S307
             return ExecutionResult(
                 success=True,
                 return_value=result,
-                namespace=namespace,
+                namespace=_user_names(namespace),
             )
         except Exception as exc:
             return ExecutionResult(
@@ -66,8 +72,31 @@ def execute_code(source: str, test_call: Optional[str] = None) -> ExecutionResul
                 return_value=None,
                 error=str(exc),
                 error_type=type(exc).__name__,
-                traceback_str=traceback.format_exc(),
-                namespace=namespace,
+                traceback_str=traceback.format_exc(limit=-MAX_TRACEBACK_FRAMES),
+                namespace=_user_names(namespace),
             )
 
-    return ExecutionResult(success=True, namespace=namespace)
+    return ExecutionResult(success=True, namespace=_user_names(namespace))
+
+
+def _user_names(namespace: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the names defined by the executed code.
+
+    Dunder entries (``__builtins__`` in particular) and imported modules
+    are dropped so the result stays small and picklable.
+    """
+    return {
+        name: value
+        for name, value in namespace.items()
+        if not name.startswith("__") and not isinstance(value, ModuleType)
+    }
+
+
+@lru_cache(maxsize=128)
+def _compile(source: str, mode: str) -> CodeType:
+    """Compile *source*, reusing the code object when it is run again.
+
+    The repair loop frequently re-executes identical sources and test
+    calls; code objects are immutable, so they can be shared safely.
+    """
+    return compile(source, "<string>", mode)
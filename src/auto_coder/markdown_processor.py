@@ -8,20 +8,20 @@ loop until it succeeds or the maximum number of iterations is reached.
 from __future__ import annotations
 
 import logging
-import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from .execution import ExecutionResult, execute_code
 from .diagnosis import Diagnosis, diagnose
-from .repair import repair_code
+from .repair import RepairCache, repair_code
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_MAX_ITERATIONS = 5
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeBlock:
     """A single code block extracted from a Markdown document."""
 
@@ -30,7 +30,7 @@ class CodeBlock:
     start_line: int
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockResult:
     """Result of processing a single code block."""
 
@@ -43,7 +43,7 @@ class BlockResult:
     last_diagnosis: Optional[Diagnosis] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MarkdownResult:
     """Aggregated result of processing all code blocks in a document."""
 
@@ -64,12 +64,6 @@ class MarkdownResult:
 # Stage 1: Extract
 # ---------------------------------------------------------------------------
 
-_FENCE_RE = re.compile(
-    r"^(?P<fence>`{3,}|~{3,})(?P<lang>\w*)\s*\n(?P<code>.*?)^(?P=fence)\s*$",
-    re.MULTILINE | re.DOTALL,
-)
-
-
 def extract_code_blocks(markdown_text: str) -> List[CodeBlock]:
     """Extract fenced code blocks from *markdown_text*.
 
@@ -82,19 +76,66 @@ def extract_code_blocks(markdown_text: str) -> List[CodeBlock]:
     Returns:
         A list of ``CodeBlock`` objects in document order.
     """
+    if "```" not in markdown_text and "~~~" not in markdown_text:
+        return []
+
     blocks: List[CodeBlock] = []
-    for m in _FENCE_RE.finditer(markdown_text):
-        start_line = markdown_text[: m.start()].count("\n") + 1
+    lines = markdown_text.split("\n")
+    # Fences already known to have no closing line further down.
+    unclosed = set()
+
+    index = 0
+    while index < len(lines):
+        opening = _parse_opening_fence(lines[index])
+        if opening is None or opening[0] in unclosed:
+            index += 1
+            continue
+
+        fence, language = opening
+        closing = _find_closing_fence(lines, index + 1, fence)
+        if closing is None:
+            # Not a block: resume scanning on the line after the opener.
+            unclosed.add(fence)
+            index += 1
+            continue
+
+        # Whitespace-only lines directly after the opener are not code.
+        body = index + 1
+        while body < closing and not lines[body].strip():
+            body += 1
+
         blocks.append(
             CodeBlock(
-                language=m.group("lang").lower(),
-                source=m.group("code"),
-                start_line=start_line,
+                language=language.lower(),
+                source="".join(line + "\n" for line in lines[body:closing]),
+                start_line=index + 1,
             )
         )
+        index = closing + 1
     return blocks
 
 
+def _parse_opening_fence(line: str) -> Optional[Tuple[str, str]]:
+    """Return ``(fence, language)`` if *line* opens a code block."""
+    if not line.startswith(("```", "~~~")):
+        return None
+
+    fence = line[: len(line) - len(line.lstrip(line[0]))]
+    language = line[len(fence):].rstrip()
+    if not all(ch.isalnum() or ch == "_" for ch in language):
+        return None
+    return fence, language
+
+
+def _find_closing_fence(lines: List[str], start: int, fence: str) -> Optional[int]:
+    """Return the index of the first line from *start* that closes *fence*."""
+    for index in range(start, len(lines)):
+        line = lines[index]
+        if line.startswith(fence) and not line[len(fence):].strip():
+            return index
+    return None
+
+
 # ---------------------------------------------------------------------------
 # Stage 2: Normalize
 # ---------------------------------------------------------------------------
@@ -117,21 +158,19 @@ def normalize_code(source: str) -> str:
     code = source.expandtabs(4)
 
     # Strip leading/trailing blank lines while preserving internal structure
-    lines = code.split("\n")
-    while lines and not lines[0].strip():
-        lines.pop(0)
-    while lines and not lines[-1].strip():
-        lines.pop()
-
-    if not lines:
+    content_start = len(code) - len(code.lstrip())
+    if content_start == len(code):
         return ""
+    content_end = len(code.rstrip())
+    start = code.rfind("\n", 0, content_start) + 1
+    end = code.find("\n", content_end)
+    code = code[start:] if end == -1 else code[start:end]
 
-    # Dedent: remove the smallest common indent
-    non_empty = [line for line in lines if line.strip()]
-    if non_empty:
-        min_indent = min(len(line) - len(line.lstrip()) for line in non_empty)
-        if min_indent > 0:
-            lines = [line[min_indent:] if len(line) >= min_indent else line for line in lines]
+    # Dedent: remove the smallest indent among non-blank lines
+    lines = code.split("\n")
+    min_indent = min(len(line) - len(line.lstrip()) for line in lines if line.strip())
+    if min_indent > 0:
+        lines = [line[min_indent:] if len(line) >= min_indent else line for line in lines]
 
     return "\n".join(lines) + "\n"
 
@@ -145,9 +184,14 @@ def _run_block_loop(
     block_index: int,
     max_iterations: int,
     repair_command: Optional[str] = None,
+    repair_cache: Optional[RepairCache] = None,
 ) -> BlockResult:
     """Run the execute → diagnose → repair loop for a single code block."""
     original = source
+    # Diagnoses seen so far; a repeat means the repairs are going in circles.
+    seen_failures = set()
+    # Every version of the code run so far: re-running one cannot help.
+    seen_sources = {source}
 
     for iteration in range(1, max_iterations + 1):
         logger.info(
@@ -173,13 +217,30 @@ def _run_block_loop(
         if diag:
             logger.info("  Block %d — %s: %s", block_index, diag.error_category, diag.root_cause)
 
+            signature = (diag.error_category, diag.root_cause, result.error)
+            if signature in seen_failures:
+                logger.info("  Block %d — same failure as before, giving up", block_index)
+                return BlockResult(
+                    block_index=block_index,
+                    original_code=original,
+                    final_code=source,
+                    success=False,
+                    iterations=iteration,
+                    execution_result=result,
+                    last_diagnosis=diag,
+                )
+            seen_failures.add(signature)
+
             # Repair
-            repaired = repair_code(source, diag, repair_command=repair_command)
-            if repaired != source:
+            repaired = repair_code(
+                source, diag, repair_command=repair_command, cache=repair_cache
+            )
+            if repaired not in seen_sources:
                 source = repaired
+                seen_sources.add(source)
                 logger.info("  Block %d — repaired, retrying", block_index)
             else:
-                logger.info("  Block %d — no automatic repair available", block_index)
+                logger.info("  Block %d — no new repair available", block_index)
                 return BlockResult(
                     block_index=block_index,
                     original_code=original,
@@ -223,6 +284,7 @@ def process_markdown(
     *,
     max_iterations: int = DEFAULT_MAX_ITERATIONS,
     repair_command: Optional[str] = None,
+    max_workers: int = 1,
 ) -> MarkdownResult:
     """Process all code blocks in a Markdown file.
 
@@ -242,6 +304,9 @@ def process_markdown(
         repair_command: Optional CLI command template for external repair
                         tools.  Supports ``{issue_file}`` and
                         ``{source_file}`` placeholders.
+        max_workers: Number of blocks processed concurrently.  Blocks
+                     run in threads, so this mainly helps when repairs
+                     wait on an external *repair_command*.
 
     Returns:
         A ``MarkdownResult`` summarising outcomes for every block.
@@ -257,6 +322,7 @@ def process_markdown(
         filepath=filepath,
         max_iterations=max_iterations,
         repair_command=repair_command,
+        max_workers=max_workers,
     )
 
 
@@ -266,6 +332,7 @@ def process_markdown_text(
     filepath: str = "<string>",
     max_iterations: int = DEFAULT_MAX_ITERATIONS,
     repair_command: Optional[str] = None,
+    max_workers: int = 1,
 ) -> MarkdownResult:
     """Process code blocks from raw Markdown text.
 
@@ -279,6 +346,9 @@ def process_markdown_text(
         repair_command: Optional CLI command template for external repair
                         tools.  Supports ``{issue_file}`` and
                         ``{source_file}`` placeholders.
+        max_workers: Number of blocks processed concurrently.  Blocks
+                     run in threads, so this mainly helps when repairs
+                     wait on an external *repair_command*.
 
     Returns:
         A ``MarkdownResult`` summarising outcomes for every block.
@@ -293,7 +363,11 @@ def process_markdown_text(
     logger.info("Executable blocks: %d", len(executable_blocks))
 
     md_result = MarkdownResult(filepath=filepath, total_blocks=len(blocks))
+    # Shared by all blocks: documents often repeat the same broken snippet.
+    # Every block is still executed; only the repairs are reused.
+    repair_cache: RepairCache = {}
 
+    pending: List[Tuple[str, int]] = []
     for idx, block in enumerate(executable_blocks):
         logger.info("Processing block %d (line %d)", idx, block.start_line)
 
@@ -302,10 +376,25 @@ def process_markdown_text(
         if not normalized.strip():
             logger.info("  Block %d - empty after normalization, skipping", idx)
             continue
+        pending.append((normalized, idx))
+
+    # Stages 3-6: Execute → Diagnose → Repair loop
+    def run_block(job: Tuple[str, int]) -> BlockResult:
+        normalized, idx = job
+        return _run_block_loop(
+            normalized,
+            idx,
+            max_iterations,
+            repair_command=repair_command,
+            repair_cache=repair_cache,
+        )
 
-        # Stages 3-6: Execute → Diagnose → Repair loop
-        block_result = _run_block_loop(normalized, idx, max_iterations, repair_command=repair_command)
-        md_result.block_results.append(block_result)
+    if max_workers > 1 and len(pending) > 1:
+        # Each block gets its own namespace, so blocks are independent.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            md_result.block_results.extend(executor.map(run_block, pending))
+    else:
+        md_result.block_results.extend(map(run_block, pending))
 
     logger.info(
         "=== Markdown Processing Complete — %d/%d succeeded ===",
@@ -24,7 +24,7 @@ logger = logging.getLogger(__name__)
 DEFAULT_MAX_ITERATIONS = 5
 
 
-@dataclass
+@dataclass(slots=True)
 class IterationRecord:
     """Record of a single iteration through the loop."""
 
@@ -35,7 +35,7 @@ class IterationRecord:
     repaired: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineResult:
     """Final result of the pipeline execution."""
 
@@ -97,6 +97,10 @@ def run_pipeline(
     logger.info("  Generated %d bytes of code", len(source))
 
     iterations: List[IterationRecord] = []
+    # Diagnoses seen so far; a repeat means the repairs are going in circles.
+    seen_failures = set()
+    # Every version of the code run so far: re-running one cannot help.
+    seen_sources = {source}
 
     for iteration in range(1, max_iterations + 1):
         logger.info("--- Iteration %d/%d ---", iteration, max_iterations)
@@ -136,21 +140,34 @@ def run_pipeline(
             logger.info("  Root cause: %s", diag.root_cause)
             logger.info("  Suggestion: %s", diag.suggestion)
 
+            signature = (diag.error_category, diag.root_cause, result.error)
+            if signature in seen_failures:
+                logger.info("  Same failure as a previous iteration — giving up")
+                iterations.append(record)
+                break
+            seen_failures.add(signature)
+
             # Stage 6: Repair
             logger.info("Stage 6: Repair")
             repaired_source = repair_code(source, diag, repair_command=repair_command)
-            if repaired_source != source:
-                record.repaired = True
-                source = repaired_source
-                logger.info("  Code repaired — retrying")
-            else:
+            if repaired_source == source:
                 logger.info("  No automatic repair available")
+                iterations.append(record)
+                break
+            if repaired_source in seen_sources:
+                logger.info("  Repair reproduces earlier code — giving up")
+                iterations.append(record)
+                break
+            record.repaired = True
+            source = repaired_source
+            seen_sources.add(source)
+            logger.info("  Code repaired — retrying")
         else:
             logger.info("  No diagnosis available")
 
         iterations.append(record)
 
-    logger.info("=== Pipeline Complete (max iterations reached) ===")
+    logger.info("=== Pipeline Complete (no passing solution) ===")
     return PipelineResult(
         success=False,
         task_description=task_description,
@@ -158,6 +175,6 @@ def run_pipeline(
         design=design,
         final_code=source,
         iterations=iterations,
-        total_iterations=max_iterations,
+        total_iterations=len(iterations),
         final_result=iterations[-1].execution_result if iterations else None,
     )
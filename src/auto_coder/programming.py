@@ -21,8 +21,6 @@ def generate_code(design: SolutionDesign) -> str:
         A string containing valid Python source code.
     """
     params_str = ", ".join(design.parameters)
-    steps_comments = _format_steps_as_comments(design.algorithm_steps)
-    body = _generate_body(design)
 
     lines = [
         f"def {design.function_name}({params_str}):",
@@ -30,8 +28,9 @@ def generate_code(design: SolutionDesign) -> str:
         f"    {design.description}",
         '    """',
     ]
-    code = "\n".join(lines) + "\n" + steps_comments + body
-    return code
+    lines.extend(_format_steps_as_comments(design.algorithm_steps))
+    lines.extend(_generate_body(design))
+    return "\n".join(lines) + "\n"
 
 
 def apply_patch(source: str, patch: str) -> str:
@@ -52,70 +51,129 @@ def apply_patch(source: str, patch: str) -> str:
     return source
 
 
-def _format_steps_as_comments(steps: List[str]) -> str:
-    """Format algorithm steps as inline comments."""
-    lines: List[str] = []
-    for i, step in enumerate(steps, 1):
-        lines.append(f"    # Step {i}: {step}")
-    return "\n".join(lines) + "\n" if lines else ""
+def _format_steps_as_comments(steps: List[str]) -> List[str]:
+    """Format algorithm steps as inline comment lines."""
+    return [f"    # Step {i}: {step}" for i, step in enumerate(steps, 1)]
 
 
-def _generate_body(design: SolutionDesign) -> str:
-    """Generate the function body based on the design."""
+def _generate_body(design: SolutionDesign) -> List[str]:
+    """Generate the function body lines based on the design."""
     desc_lower = design.description.lower()
-    lines: List[str] = []
-
-    if "sum" in desc_lower and "list" in desc_lower:
-        lines.append("    total = 0")
-        lines.append("    for item in items:")
-        lines.append("        total += item")
-        lines.append("    return total")
-    elif "sort" in desc_lower:
-        param = design.parameters[0].split(":")[0].strip() if design.parameters else "data"
-        lines.append(f"    return sorted({param})")
-    elif "reverse" in desc_lower:
-        param = design.parameters[0].split(":")[0].strip() if design.parameters else "data"
-        lines.append(f"    if isinstance({param}, str):")
-        lines.append(f"        return {param}[::-1]")
-        lines.append(f"    return list(reversed({param}))")
-    elif "factorial" in desc_lower:
-        lines.append("    if n < 0:")
-        lines.append("        raise ValueError('n must be non-negative')")
-        lines.append("    if n <= 1:")
-        lines.append("        return 1")
-        lines.append("    return n * %s(n - 1)" % design.function_name)
-    elif "fibonacci" in desc_lower:
-        lines.append("    if n <= 0:")
-        lines.append("        return 0")
-        lines.append("    if n == 1:")
-        lines.append("        return 1")
-        lines.append("    a, b = 0, 1")
-        lines.append("    for _ in range(2, n + 1):")
-        lines.append("        a, b = b, a + b")
-        lines.append("    return b")
-    elif "palindrome" in desc_lower:
-        param = design.parameters[0].split(":")[0].strip() if design.parameters else "s"
-        lines.append(f"    cleaned = str({param}).lower().replace(' ', '')")
-        lines.append("    return cleaned == cleaned[::-1]")
-    elif "count" in desc_lower:
-        param = design.parameters[0].split(":")[0].strip() if design.parameters else "data"
-        lines.append(f"    return len({param})")
-    elif "max" in desc_lower or "largest" in desc_lower:
-        param = design.parameters[0].split(":")[0].strip() if design.parameters else "data"
-        lines.append(f"    return max({param})")
-    elif "min" in desc_lower or "smallest" in desc_lower:
-        param = design.parameters[0].split(":")[0].strip() if design.parameters else "data"
-        lines.append(f"    return min({param})")
-    elif "average" in desc_lower or "mean" in desc_lower:
-        param = design.parameters[0].split(":")[0].strip() if design.parameters else "data"
-        lines.append(f"    if not {param}:")
-        lines.append("        return 0.0")
-        lines.append(f"    return sum({param}) / len({param})")
-    elif ("add" in desc_lower or "sum" in desc_lower) and "two" in desc_lower:
-        lines.append("    return a + b")
-    else:
-        # Generic pass-through implementation
-        param = design.parameters[0].split(":")[0].strip() if design.parameters else "data"
-        lines.append(f"    return {param}")
 
-    return "\n".join(lines) + "\n"
+    for keyword_groups, body in _BODY_RULES:
+        if all(any(kw in desc_lower for kw in group) for group in keyword_groups):
+            return body(design)
+
+    # Generic pass-through implementation
+    return [f"    return {_first_param(design)}"]
+
+
+def _first_param(design: SolutionDesign, default: str = "data") -> str:
+    """Return the name of the first parameter, without its annotation."""
+    return design.parameters[0].split(":")[0].strip() if design.parameters else default
+
+
+def _sum_list_body(design: SolutionDesign) -> List[str]:
+    """Sum the items of a list."""
+    return [
+        "    total = 0",
+        "    for item in items:",
+        "        total += item",
+        "    return total",
+    ]
+
+
+def _sort_body(design: SolutionDesign) -> List[str]:
+    """Return the data sorted."""
+    return [f"    return sorted({_first_param(design)})"]
+
+
+def _reverse_body(design: SolutionDesign) -> List[str]:
+    """Reverse a string or sequence."""
+    param = _first_param(design)
+    return [
+        f"    if isinstance({param}, str):",
+        f"        return {param}[::-1]",
+        f"    return list(reversed({param}))",
+    ]
+
+
+def _factorial_body(design: SolutionDesign) -> List[str]:
+    """Recursive factorial of ``n``."""
+    return [
+        "    if n < 0:",
+        "        raise ValueError('n must be non-negative')",
+        "    if n <= 1:",
+        "        return 1",
+        "    return n * %s(n - 1)" % design.function_name,
+    ]
+
+
+def _fibonacci_body(design: SolutionDesign) -> List[str]:
+    """Iterative ``n``-th Fibonacci number."""
+    return [
+        "    if n <= 0:",
+        "        return 0",
+        "    if n == 1:",
+        "        return 1",
+        "    a, b = 0, 1",
+        "    for _ in range(2, n + 1):",
+        "        a, b = b, a + b",
+        "    return b",
+    ]
+
+
+def _palindrome_body(design: SolutionDesign) -> List[str]:
+    """Case- and space-insensitive palindrome check."""
+    param = _first_param(design, "s")
+    return [
+        f"    cleaned = str({param}).lower().replace(' ', '')",
+        "    return cleaned == cleaned[::-1]",
+    ]
+
+
+def _count_body(design: SolutionDesign) -> List[str]:
+    """Count the elements."""
+    return [f"    return len({_first_param(design)})"]
+
+
+def _max_body(design: SolutionDesign) -> List[str]:
+    """Return the largest element."""
+    return [f"    return max({_first_param(design)})"]
+
+
+def _min_body(design: SolutionDesign) -> List[str]:
+    """Return the smallest element."""
+    return [f"    return min({_first_param(design)})"]
+
+
+def _average_body(design: SolutionDesign) -> List[str]:
+    """Arithmetic mean, ``0.0`` when empty."""
+    param = _first_param(design)
+    return [
+        f"    if not {param}:",
+        "        return 0.0",
+        f"    return sum({param}) / len({param})",
+    ]
+
+
+def _add_two_body(design: SolutionDesign) -> List[str]:
+    """Add the two operands."""
+    return ["    return a + b"]
+
+
+# Checked in order; the first rule whose keyword groups all match (any
+# keyword within a group) supplies the body.
+_BODY_RULES = (
+    ((("sum",), ("list",)), _sum_list_body),
+    ((("sort",),), _sort_body),
+    ((("reverse",),), _reverse_body),
+    ((("factorial",),), _factorial_body),
+    ((("fibonacci",),), _fibonacci_body),
+    ((("palindrome",),), _palindrome_body),
+    ((("count",),), _count_body),
+    ((("max", "largest"),), _max_body),
+    ((("min", "smallest"),), _min_body),
+    ((("average", "mean"),), _average_body),
+    ((("add", "sum"), ("two",)), _add_two_body),
+)
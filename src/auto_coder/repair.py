@@ -10,12 +10,15 @@ built-in handlers cannot fix the issue.
 
 from __future__ import annotations
 
+import ast
 import logging
 import os
 import re
+import signal
 import subprocess
 import tempfile
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
 
 from .diagnosis import Diagnosis
 
@@ -23,11 +26,43 @@ logger = logging.getLogger(__name__)
 
 CLI_REPAIR_TIMEOUT = 120  # seconds
 
+RepairCache = Dict[Tuple, str]
+
+_BLOCK_KEYWORDS = ("def ", "if ", "elif ", "else", "for ", "while ", "class ", "try", "except", "finally")
+_BLOCK_HEAD_RE = re.compile(r'^\s*(def |if |elif |else|for |while |class |try|except|finally)')
+_QUOTED_NAME_RE = re.compile(r"'(\w+)'")
+# Root cause text diagnosis produces for a NameError
+_UNDEFINED_NAME_RE = re.compile(r"'(\w+)' is used but not defined")
+_OPERATOR_RE = re.compile(r'[\+\-\*/]')
+_BINOP_RE = re.compile(r'(\b\w+\b)\s*([+\-*/])\s*(\b\w+\b)')
+_INDEX_RE = re.compile(r'(\w+)\[(\w+)\]')
+_DICT_KEY_RE = re.compile(r'(\w+)\[([\'"][^\'"]+[\'"])\]')
+_DIVISOR_RE = re.compile(r'/\s*(\w+)')
+_DEF_PARAM_RE = re.compile(r'def \w+\((\w+)')
+
+# Undefined names that almost always mean a forgotten import
+_COMMON_IMPORTS = {
+    "collections": "import collections",
+    "datetime": "import datetime",
+    "functools": "import functools",
+    "itertools": "import itertools",
+    "json": "import json",
+    "math": "import math",
+    "os": "import os",
+    "random": "import random",
+    "re": "import re",
+    "sys": "import sys",
+    "time": "import time",
+    "np": "import numpy as np",
+    "pd": "import pandas as pd",
+}
+
 
 def repair_code(
     source: str,
     diagnosis: Diagnosis,
     repair_command: Optional[str] = None,
+    cache: Optional[RepairCache] = None,
 ) -> str:
     """Attempt to automatically repair source code based on a diagnosis.
 
@@ -41,28 +76,46 @@ def repair_code(
         repair_command: Optional CLI command template.  May contain the
             placeholders ``{issue_file}`` and ``{source_file}`` which
             will be replaced with paths to temporary files.
+        cache: Optional dict memoising repairs for the lifetime of a run.
+            A source/diagnosis pair already seen is answered from it
+            instead of re-running the handlers or the external tool.
 
     Returns:
         The repaired source code.  If no automatic repair is possible,
         returns the original source unchanged.
     """
-    category = diagnosis.error_category
-
-    repair_handlers = {
-        "syntax": _repair_syntax,
-        "reference": _repair_reference,
-        "type": _repair_type,
-        "index": _repair_index,
-        "key": _repair_key,
-        "arithmetic": _repair_arithmetic,
-        "recursion": _repair_recursion,
-    }
-
-    handler = repair_handlers.get(category)
-    if handler:
-        repaired = handler(source, diagnosis)
-        if repaired != source:
-            return repaired
+    if cache is None:
+        return _repair_uncached(source, diagnosis, repair_command)
+
+    key = (
+        source,
+        diagnosis.error_category,
+        diagnosis.root_cause,
+        diagnosis.suggestion,
+        diagnosis.line_number,
+        repair_command,
+    )
+    repaired = cache.get(key)
+    if repaired is None:
+        repaired = cache[key] = _repair_uncached(source, diagnosis, repair_command)
+    return repaired
+
+
+def _repair_uncached(
+    source: str,
+    diagnosis: Diagnosis,
+    repair_command: Optional[str],
+) -> str:
+    """Run the built-in handlers, then the external CLI fallback."""
+    repaired = _builtin_repair(
+        source,
+        diagnosis.error_category,
+        diagnosis.root_cause,
+        diagnosis.suggestion,
+        diagnosis.line_number,
+    )
+    if repaired != source:
+        return repaired
 
     # Fallback to an external CLI tool when built-in repair has no effect
     if repair_command:
@@ -98,66 +151,84 @@ def repair_code_with_cli(
         The (possibly repaired) source code.  If the command fails
         or produces no change the original source is returned.
     """
-    tmpdir = tempfile.mkdtemp(prefix="auto_coder_repair_")
-    issue_path = os.path.join(tmpdir, "issue.md")
-    source_path = os.path.join(tmpdir, "source.py")
+    with tempfile.TemporaryDirectory(
+        prefix="auto_coder_repair_", ignore_cleanup_errors=True
+    ) as tmpdir:
+        issue_path = os.path.join(tmpdir, "issue.md")
+        source_path = os.path.join(tmpdir, "source.py")
 
-    try:
-        # Write issue description
-        issue_content = _build_issue_description(source, diagnosis)
-        with open(issue_path, "w", encoding="utf-8") as fh:
-            fh.write(issue_content)
-
-        # Write source code
-        with open(source_path, "w", encoding="utf-8") as fh:
-            fh.write(source)
-
-        # Build the actual command
-        cmd = repair_command.replace("{issue_file}", issue_path)
-        cmd = cmd.replace("{source_file}", source_path)
-
-        logger.info("Running repair command: %s", cmd)
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=CLI_REPAIR_TIMEOUT,
-        )
+        try:
+            # Write issue description
+            issue_content = _build_issue_description(source, diagnosis)
+            with open(issue_path, "w", encoding="utf-8") as fh:
+                fh.write(issue_content)
+
+            # Write source code
+            with open(source_path, "w", encoding="utf-8") as fh:
+                fh.write(source)
+
+            # Build the actual command
+            cmd = repair_command.replace("{issue_file}", issue_path)
+            cmd = cmd.replace("{source_file}", source_path)
+
+            logger.info("Running repair command: %s", cmd)
+            # The tool reports back through the source file; its stdout is
+            # never used, and stderr is only decoded for the failure log.
+            # A new session lets a timeout kill the whole process group,
+            # not just the shell: orphans would keep running and hold
+            # the stderr pipe open.
+            with subprocess.Popen(
+                cmd,
+                shell=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                start_new_session=True,
+            ) as proc:
+                try:
+                    _, stderr = proc.communicate(timeout=CLI_REPAIR_TIMEOUT)
+                except subprocess.TimeoutExpired:
+                    _kill_process_group(proc)
+                    proc.communicate()
+                    raise
+                except BaseException:
+                    # Ctrl-C and the like: don't leave the tool running.
+                    _kill_process_group(proc)
+                    proc.wait()
+                    raise
+
+            if proc.returncode != 0:
+                logger.warning(
+                    "Repair command exited with code %d: %s",
+                    proc.returncode,
+                    stderr.decode(errors="replace").strip(),
+                )
+                return source
+
+            # Read back (possibly repaired) source
+            with open(source_path, encoding="utf-8") as fh:
+                repaired = fh.read()
 
-        if result.returncode != 0:
-            logger.warning(
-                "Repair command exited with code %d: %s",
-                result.returncode,
-                result.stderr.strip(),
-            )
+            if repaired and repaired.strip():
+                return repaired
             return source
 
-        # Read back (possibly repaired) source
-        with open(source_path, encoding="utf-8") as fh:
-            repaired = fh.read()
+        except subprocess.TimeoutExpired:
+            logger.warning("Repair command timed out")
+            return source
+        except Exception:
+            logger.exception("Repair command failed")
+            return source
 
-        if repaired and repaired.strip():
-            return repaired
-        return source
 
-    except subprocess.TimeoutExpired:
-        logger.warning("Repair command timed out")
-        return source
-    except Exception:
-        logger.exception("Repair command failed")
-        return source
-    finally:
-        # Clean up temp files (best-effort)
-        for path in (issue_path, source_path):
-            try:
-                os.remove(path)
-            except OSError:
-                pass
+def _kill_process_group(proc: subprocess.Popen) -> None:
+    """Kill *proc* together with any processes it started."""
+    if hasattr(os, "killpg"):
         try:
-            os.rmdir(tmpdir)
-        except OSError:
+            os.killpg(proc.pid, signal.SIGKILL)
+            return
+        except ProcessLookupError:
             pass
+    proc.kill()
 
 
 def _build_issue_description(source: str, diagnosis: Diagnosis) -> str:
@@ -188,27 +259,41 @@ def _build_issue_description(source: str, diagnosis: Diagnosis) -> str:
 
 def _repair_syntax(source: str, diagnosis: Diagnosis) -> str:
     """Attempt to fix syntax errors."""
+    has_block_head = any(kw in source for kw in _BLOCK_KEYWORDS)
+    open_count = source.count("(")
+    close_count = source.count(")")
+    if not has_block_head and open_count == close_count:
+        return source
+
     lines = source.split("\n")
 
     # Fix common missing colons
-    for i, line in enumerate(lines):
-        stripped = line.rstrip()
-        if re.match(r'^\s*(def |if |elif |else|for |while |class |try|except|finally)', stripped):
-            if stripped and not stripped.endswith(":") and not stripped.endswith("\\"):
-                lines[i] = stripped + ":"
+    if has_block_head:
+        for i, line in enumerate(lines):
+            stripped = line.rstrip()
+            if _BLOCK_HEAD_RE.match(stripped):
+                if stripped and not stripped.endswith(":") and not stripped.endswith("\\"):
+                    lines[i] = stripped + ":"
 
     # Fix unmatched parentheses
-    open_count = source.count("(")
-    close_count = source.count(")")
     if open_count > close_count:
         lines[-1] = lines[-1] + ")" * (open_count - close_count)
     elif close_count > open_count:
         # Remove extra closing parens from the end
         diff = close_count - open_count
         for i in range(len(lines) - 1, -1, -1):
-            while diff > 0 and lines[i].rstrip().endswith(")"):
-                lines[i] = lines[i].rstrip()[:-1]
+            # Walk back over trailing ')' (and whitespace between them),
+            # then cut the line once.
+            line = lines[i]
+            end = len(line.rstrip())
+            cut = None
+            while diff > 0 and end > 0 and line[end - 1] == ")":
+                cut = end = end - 1
                 diff -= 1
+                while end > 0 and line[end - 1].isspace():
+                    end -= 1
+            if cut is not None:
+                lines[i] = line[:cut]
             if diff == 0:
                 break
 
@@ -217,46 +302,77 @@ def _repair_syntax(source: str, diagnosis: Diagnosis) -> str:
 
 def _repair_reference(source: str, diagnosis: Diagnosis) -> str:
     """Attempt to fix reference errors (NameError, AttributeError)."""
-    match = re.search(r"'(\w+)'", diagnosis.root_cause)
+    match = _QUOTED_NAME_RE.search(diagnosis.root_cause)
     if not match:
         return source
 
     missing_name = match.group(1)
+    if missing_name not in source:
+        return source
+    statement = _COMMON_IMPORTS.get(missing_name)
+    if (
+        statement
+        and _UNDEFINED_NAME_RE.search(diagnosis.root_cause)
+        and statement not in source.split("\n")
+    ):
+        return _insert_import(source, statement)
     lines = source.split("\n")
+    call_pattern = _call_pattern(missing_name)
 
-    # Check if it looks like a function call
-    call_pattern = re.compile(rf'\b{re.escape(missing_name)}\s*\(')
-    is_function_call = any(call_pattern.search(line) for line in lines)
+    # One pass: a call anywhere wins; otherwise remember the first use
+    first_use = None
+    for i, line in enumerate(lines):
+        if missing_name not in line:
+            continue
+        if call_pattern.search(line):
+            # Prepend a stub function definition, indented like the first call
+            indent = _indent(line)
+            stub = f"{indent}def {missing_name}(*args, **kwargs):\n{indent}    pass\n"
+            return stub + source
+        if first_use is None:
+            first_use = i
+
+    # Add a variable initialization before the first use
+    if first_use is not None:
+        indent = _indent(lines[first_use])
+        lines.insert(first_use, f"{indent}{missing_name} = None")
+    return "\n".join(lines)
 
-    if is_function_call:
-        # Add a stub function definition before the first use
-        indent = ""
-        for line in lines:
-            if call_pattern.search(line):
-                indent = re.match(r'^(\s*)', line).group(1)
-                break
-        stub = f"{indent}def {missing_name}(*args, **kwargs):\n{indent}    pass\n"
-        return stub + source
-    else:
-        # Add a variable initialization before the first use
-        for i, line in enumerate(lines):
-            if missing_name in line:
-                indent = re.match(r'^(\s*)', line).group(1)
-                lines.insert(i, f"{indent}{missing_name} = None")
-                break
-        return "\n".join(lines)
+
+def _insert_import(source: str, statement: str) -> str:
+    """Insert *statement* after any module docstring and ``__future__`` imports."""
+    try:
+        body = ast.parse(source).body
+    except SyntaxError:
+        body = []
+
+    position = 0
+    for index, node in enumerate(body):
+        is_docstring = (
+            index == 0
+            and isinstance(node, ast.Expr)
+            and isinstance(node.value, ast.Constant)
+            and isinstance(node.value.value, str)
+        )
+        is_future = isinstance(node, ast.ImportFrom) and node.module == "__future__"
+        if not (is_docstring or is_future):
+            break
+        position = node.end_lineno
+
+    lines = source.split("\n")
+    lines.insert(position, statement)
+    return "\n".join(lines)
 
 
 def _repair_type(source: str, diagnosis: Diagnosis) -> str:
     """Attempt to fix type errors."""
-    if "unsupported operand" in diagnosis.root_cause:
+    if "unsupported operand" in diagnosis.root_cause and _OPERATOR_RE.search(source):
         # Wrap numeric operations with int() / float()
         lines = source.split("\n")
         for i, line in enumerate(lines):
-            if re.search(r'[\+\-\*/]', line) and not line.strip().startswith("#"):
+            if _OPERATOR_RE.search(line) and not _is_comment(line):
                 # Try to add explicit type conversion
-                line = re.sub(r'(\b\w+\b)\s*([+\-*/])\s*(\b\w+\b)',
-                              r'int(\1) \2 int(\3)', line, count=1)
+                line = _BINOP_RE.sub(r'int(\1) \2 int(\3)', line, count=1)
                 lines[i] = line
                 break
         return "\n".join(lines)
@@ -265,13 +381,17 @@ def _repair_type(source: str, diagnosis: Diagnosis) -> str:
 
 def _repair_index(source: str, diagnosis: Diagnosis) -> str:
     """Attempt to fix index errors by adding bounds checking."""
+    if not _INDEX_RE.search(source):
+        return source
     lines = source.split("\n")
     for i, line in enumerate(lines):
-        match = re.search(r'(\w+)\[(\w+)\]', line)
-        if match and not line.strip().startswith("#"):
+        if "[" not in line:
+            continue
+        match = _INDEX_RE.search(line)
+        if match and not _is_comment(line):
             var_name = match.group(1)
             idx_expr = match.group(2)
-            indent = re.match(r'^(\s*)', line).group(1)
+            indent = _indent(line)
             guard = f"{indent}if {idx_expr} < len({var_name}):\n"
             lines[i] = guard + "    " + line
             break
@@ -280,10 +400,14 @@ def _repair_index(source: str, diagnosis: Diagnosis) -> str:
 
 def _repair_key(source: str, diagnosis: Diagnosis) -> str:
     """Attempt to fix key errors by using .get()."""
+    if not _DICT_KEY_RE.search(source):
+        return source
     lines = source.split("\n")
     for i, line in enumerate(lines):
-        match = re.search(r'(\w+)\[([\'"][^\'"]+[\'"])\]', line)
-        if match and not line.strip().startswith("#"):
+        if "[" not in line:
+            continue
+        match = _DICT_KEY_RE.search(line)
+        if match and not _is_comment(line):
             var_name = match.group(1)
             key = match.group(2)
             old = f"{var_name}[{key}]"
@@ -295,13 +419,15 @@ def _repair_key(source: str, diagnosis: Diagnosis) -> str:
 
 def _repair_arithmetic(source: str, diagnosis: Diagnosis) -> str:
     """Attempt to fix arithmetic errors like division by zero."""
+    if "/" not in source:
+        return source
     lines = source.split("\n")
     for i, line in enumerate(lines):
-        if "/" in line and not line.strip().startswith("#"):
-            match = re.search(r'/\s*(\w+)', line)
+        if "/" in line and not _is_comment(line):
+            match = _DIVISOR_RE.search(line)
             if match:
                 divisor = match.group(1)
-                indent = re.match(r'^(\s*)', line).group(1)
+                indent = _indent(line)
                 guard = f"{indent}if {divisor} == 0:\n{indent}    {divisor} = 1  # avoid division by zero\n"
                 lines.insert(i, guard)
                 break
@@ -310,13 +436,14 @@ def _repair_arithmetic(source: str, diagnosis: Diagnosis) -> str:
 
 def _repair_recursion(source: str, diagnosis: Diagnosis) -> str:
     """Attempt to fix infinite recursion by adding a base case."""
+    if "def " not in source:
+        return source
     lines = source.split("\n")
     for i, line in enumerate(lines):
         if line.strip().startswith("def "):
-            indent_match = re.match(r'^(\s*)', line)
-            body_indent = (indent_match.group(1) if indent_match else "") + "    "
+            body_indent = _indent(line) + "    "
             # Find the parameter name
-            param_match = re.search(r'def \w+\((\w+)', line)
+            param_match = _DEF_PARAM_RE.search(line)
             if param_match:
                 param = param_match.group(1)
                 base_case = (
@@ -326,3 +453,73 @@ def _repair_recursion(source: str, diagnosis: Diagnosis) -> str:
                 lines.insert(i + 1, base_case)
             break
     return "\n".join(lines)
+
+
+def _is_comment(line: str) -> bool:
+    """Return whether *line* is a comment-only line."""
+    return line.lstrip().startswith("#")
+
+
+def _indent(line: str) -> str:
+    """Return the leading whitespace of *line*."""
+    return line[: len(line) - len(line.lstrip())]
+
+
+@lru_cache(maxsize=256)
+def _builtin_repair(
+    source: str,
+    error_category: str,
+    root_cause: str,
+    suggestion: str,
+    line_number: Optional[int],
+) -> str:
+    """Apply the built-in handler for *error_category*.
+
+    The handlers are pure functions of the source and the diagnosis
+    fields, so their results are memoised across runs.
+    """
+    handler = _REPAIR_HANDLERS.get(error_category)
+    if handler is None:
+        return source
+    diagnosis = Diagnosis(error_category, root_cause, suggestion, line_number)
+
+    if error_category == "syntax":
+        # Source that compiles has no syntax error to fix (the failing
+        # code is elsewhere, e.g. in the test call).
+        if _is_valid_python(source):
+            return source
+        return handler(source, diagnosis)
+
+    # A fix for a runtime error must not leave the code uncompilable.
+    repaired = handler(source, diagnosis)
+    if repaired != source and not _is_valid_python(repaired):
+        logger.debug("Discarding %s repair that breaks the syntax", error_category)
+        return source
+    return repaired
+
+
+@lru_cache(maxsize=256)
+def _is_valid_python(source: str) -> bool:
+    """Return whether *source* compiles."""
+    try:
+        compile(source, "<repair>", "exec", dont_inherit=True)
+    except (SyntaxError, ValueError):
+        return False
+    return True
+
+
+@lru_cache(maxsize=256)
+def _call_pattern(name: str) -> re.Pattern:
+    """Compile a pattern matching a call to *name*."""
+    return re.compile(rf'\b{re.escape(name)}\s*\(')
+
+
+_REPAIR_HANDLERS: Dict[str, Callable[[str, Diagnosis], str]] = {
+    "syntax": _repair_syntax,
+    "reference": _repair_reference,
+    "type": _repair_type,
+    "index": _repair_index,
+    "key": _repair_key,
+    "arithmetic": _repair_arithmetic,
+    "recursion": _repair_recursion,
+}
@@ -11,7 +11,35 @@ from dataclasses import dataclass, field
 from typing import List
 
 
-@dataclass
+_QUOTED_NAME_RE = re.compile(r"[`'\"](\w+)[`'\"]")
+_DEF_NAME_RE = re.compile(r"(?:function|def|method)\s+(\w+)", re.IGNORECASE)
+_WORD_RE = re.compile(r"[a-zA-Z]+")
+
+_INPUT_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"(?:takes?|accepts?|receives?|given|input[s]?)\s*[:\-]?\s*(.+?)(?:\.|,\s*(?:and\s+)?return|$)",
+        r"parameter[s]?\s*[:\-]?\s*(.+?)(?:\.|$)",
+    )
+)
+
+_OUTPUT_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"(?:returns?|outputs?|produces?|yields?)\s*[:\-]?\s*(.+?)(?:\.|$)",
+        r"(?:result|output)\s+(?:is|should be)\s*[:\-]?\s*(.+?)(?:\.|$)",
+    )
+)
+
+_CONSTRAINT_PATTERNS = (
+    re.compile(
+        r"(?:must|should|cannot|without|limit|constraint|ensure)\s+(.+?)(?:\.|$)",
+        re.IGNORECASE,
+    ),
+)
+
+
+@dataclass(slots=True)
 class TaskRequirements:
     """Structured representation of a programming task."""
 
@@ -53,55 +81,40 @@ def understand_task(task_description: str) -> TaskRequirements:
 def _extract_function_name(description: str) -> str:
     """Derive a function name from the task description."""
     # Match backtick/quote-wrapped names anywhere
-    backtick_match = re.search(r"[`'\"](\w+)[`'\"]", description)
+    backtick_match = _QUOTED_NAME_RE.search(description)
     if backtick_match:
         return backtick_match.group(1)
-    match = re.search(
-        r"(?:function|def|method)\s+(\w+)",
-        description,
-        re.IGNORECASE,
-    )
+    match = _DEF_NAME_RE.search(description)
     if match:
         return match.group(1)
     # Fallback: build a name from the first meaningful words
-    words = re.findall(r"[a-zA-Z]+", description)
+    words = _WORD_RE.findall(description)
     name_words = [w.lower() for w in words[:3] if len(w) > 2]
     return "_".join(name_words) if name_words else "solution"
 
 
 def _extract_inputs(description: str) -> List[str]:
     """Identify input parameters mentioned in the description."""
-    patterns = [
-        r"(?:takes?|accepts?|receives?|given|input[s]?)\s*[:\-]?\s*(.+?)(?:\.|,\s*(?:and\s+)?return|$)",
-        r"parameter[s]?\s*[:\-]?\s*(.+?)(?:\.|$)",
-    ]
     results: List[str] = []
-    for pattern in patterns:
-        for match in re.finditer(pattern, description, re.IGNORECASE):
+    for pattern in _INPUT_PATTERNS:
+        for match in pattern.finditer(description):
             results.append(match.group(1).strip())
     return results
 
 
 def _extract_outputs(description: str) -> List[str]:
     """Identify expected outputs mentioned in the description."""
-    patterns = [
-        r"(?:returns?|outputs?|produces?|yields?)\s*[:\-]?\s*(.+?)(?:\.|$)",
-        r"(?:result|output)\s+(?:is|should be)\s*[:\-]?\s*(.+?)(?:\.|$)",
-    ]
     results: List[str] = []
-    for pattern in patterns:
-        for match in re.finditer(pattern, description, re.IGNORECASE):
+    for pattern in _OUTPUT_PATTERNS:
+        for match in pattern.finditer(description):
             results.append(match.group(1).strip())
     return results
 
 
 def _extract_constraints(description: str) -> List[str]:
     """Identify constraints mentioned in the description."""
-    patterns = [
-        r"(?:must|should|cannot|without|limit|constraint|ensure)\s+(.+?)(?:\.|$)",
-    ]
     results: List[str] = []
-    for pattern in patterns:
-        for match in re.finditer(pattern, description, re.IGNORECASE):
+    for pattern in _CONSTRAINT_PATTERNS:
+        for match in pattern.finditer(description):
             results.append(match.group(1).strip())
     return results
@@ -0,0 +1,8 @@
+"""Shared pytest configuration: makes the ``src`` layout importable."""
+
+import os
+import sys
+
+_SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
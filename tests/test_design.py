@@ -1,11 +1,7 @@
 """Tests for the design stage."""
 
-import sys
-import os
 import pytest
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
 from auto_coder.understanding import TaskRequirements
 from auto_coder.design import design_solution, SolutionDesign
 
@@ -42,3 +38,9 @@ class TestDesignSolution:
         req = TaskRequirements(description="Return true or false")
         design = design_solution(req)
         assert design.return_type == "bool"
+
+    def test_parameter_hint_priority_over_position(self):
+        # "list" outranks "number" even though "number" appears first
+        req = TaskRequirements(description="Sum a number list")
+        design = design_solution(req)
+        assert design.parameters == ["items: list"]
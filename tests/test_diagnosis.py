@@ -1,10 +1,5 @@
 """Tests for the diagnosis stage."""
 
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
 from auto_coder.execution import ExecutionResult
 from auto_coder.diagnosis import diagnose, Diagnosis
 
@@ -61,6 +56,21 @@ class TestDiagnose:
         assert diag is not None
         assert diag.line_number == 42
 
+    def test_line_number_from_innermost_user_frame(self):
+        result = ExecutionResult(
+            success=False,
+            error="division by zero",
+            error_type="ZeroDivisionError",
+            traceback_str=(
+                'File "/src/auto_coder/execution.py", line 51, in execute_code\n'
+                'File "<string>", line 4, in <module>\n'
+                'File "<string>", line 3, in f\n'
+            ),
+        )
+        diag = diagnose(result)
+        assert diag is not None
+        assert diag.line_number == 3
+
     def test_suggestion_not_empty(self):
         result = ExecutionResult(
             success=False,
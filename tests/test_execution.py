@@ -1,11 +1,6 @@
 """Tests for the execution stage."""
 
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
-from auto_coder.execution import execute_code, ExecutionResult
+from auto_coder.execution import MAX_TRACEBACK_FRAMES, execute_code, ExecutionResult
 
 
 class TestExecuteCode:
@@ -41,3 +36,20 @@ class TestExecuteCode:
     def test_namespace_populated(self):
         result = execute_code("x = 42")
         assert result.namespace.get("x") == 42
+
+    def test_namespace_excludes_builtins_and_modules(self):
+        result = execute_code("import math\nx = math.pi")
+        assert set(result.namespace) == {"x"}
+
+    def test_repeated_execution_uses_fresh_namespace(self):
+        code = "items = []\nitems.append(1)"
+        first = execute_code(code)
+        second = execute_code(code)
+        assert first.namespace["items"] == [1]
+        assert second.namespace["items"] == [1]
+
+    def test_traceback_is_truncated(self):
+        code = "def f(n):\n    return f(n + 1)\n"
+        result = execute_code(code, test_call="f(0)")
+        assert result.error_type == "RecursionError"
+        assert result.traceback_str.count('File "') <= MAX_TRACEBACK_FRAMES
@@ -1,13 +1,7 @@
 """Tests for the markdown_processor module."""
 
-import os
-import sys
-import tempfile
-
 import pytest
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
 from auto_coder.markdown_processor import (
     CodeBlock,
     BlockResult,
@@ -79,6 +73,29 @@ class TestExtractCodeBlocks:
         assert "def add" in blocks[0].source
         assert "return a + b" in blocks[0].source
 
+    def test_unclosed_fence_does_not_swallow_later_blocks(self):
+        md = "````python\nnever closed\n\n```python\nx = 1\n```\n"
+        blocks = extract_code_blocks(md)
+        assert len(blocks) == 1
+        assert blocks[0].source == "x = 1\n"
+        assert blocks[0].start_line == 4
+
+    def test_closing_fence_must_match_opener(self):
+        md = "````\n```\ninner\n```\n````\n"
+        blocks = extract_code_blocks(md)
+        assert len(blocks) == 1
+        assert blocks[0].source == "```\ninner\n```\n"
+
+    def test_large_document(self):
+        # 2 000 blocks of 5 lines each: a 10 000-line document
+        md = "".join(
+            f"Block {i}\n\n```python\nx = {i}\n```\n" for i in range(2000)
+        )
+        blocks = extract_code_blocks(md)
+        assert len(blocks) == 2000
+        assert [b.start_line for b in blocks] == [5 * i + 3 for i in range(2000)]
+        assert blocks[-1].source == "x = 1999\n"
+
 
 # ---------------------------------------------------------------------------
 # normalize_code
@@ -175,6 +192,24 @@ class TestProcessMarkdownText:
         for br in result.block_results:
             assert br.iterations <= 2
 
+    def test_stops_when_failure_repeats(self):
+        # Only the first division is ever guarded, so the same failure
+        # comes back on a shifted line
+        md = "```python\na = 0\nb = 0\nx = 1 / a\ny = 1 / b\n```\n"
+        result = process_markdown_text(md, max_iterations=5)
+        br = result.block_results[0]
+        assert br.success is False
+        assert br.iterations == 2
+        assert br.final_code.count("if a == 0:") == 1
+
+    def test_different_keys_are_not_a_repeat(self):
+        # Both failures share a category and root cause but name different keys
+        md = "```python\nd = {}\na = d['x']\nb = d['y']\n```\n"
+        result = process_markdown_text(md, max_iterations=5)
+        br = result.block_results[0]
+        assert br.success is True
+        assert br.iterations == 3
+
     def test_auto_repair_attempted(self):
         # Division by zero — repair module can add a zero-guard
         md = "```python\nx = 10\ny = 0\nresult = x / y\n```\n"
@@ -194,6 +229,25 @@ class TestProcessMarkdownText:
         result = process_markdown_text(md)
         assert result.success_count == 1
 
+    def test_duplicate_blocks_share_repairs(self, tmp_path):
+        calls = tmp_path / "calls"
+        cmd = f"echo x >> {calls} && echo 'x = 1' > {{source_file}}"
+        md = "```python\nraise RuntimeError('boom')\n```\n" * 2
+        result = process_markdown_text(md, repair_command=cmd)
+        assert result.success_count == 2
+        assert calls.read_text().count("x") == 1
+
+    def test_parallel_matches_serial(self):
+        md = "".join(
+            f"```python\nx{i} = 10 / {i % 2}\n```\n\n" for i in range(6)
+        )
+        serial = process_markdown_text(md, max_iterations=3)
+        parallel = process_markdown_text(md, max_iterations=3, max_workers=4)
+        assert [br.block_index for br in parallel.block_results] == list(range(6))
+        assert [(br.success, br.final_code) for br in parallel.block_results] == [
+            (br.success, br.final_code) for br in serial.block_results
+        ]
+
 
 # ---------------------------------------------------------------------------
 # process_markdown — file-based
@@ -202,21 +256,14 @@ class TestProcessMarkdownText:
 class TestProcessMarkdownFile:
     """Tests for process_markdown() reading from a file."""
 
-    def test_reads_file(self):
+    def test_reads_file(self, tmp_path):
         md = "```python\nx = 1 + 2\n```\n"
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".md", delete=False, encoding="utf-8"
-        ) as f:
-            f.write(md)
-            f.flush()
-            path = f.name
-
-        try:
-            result = process_markdown(path)
-            assert result.filepath == path
-            assert result.success_count == 1
-        finally:
-            os.unlink(path)
+        path = tmp_path / "demo.md"
+        path.write_bytes(md.encode("utf-8"))
+
+        result = process_markdown(str(path))
+        assert result.filepath == str(path)
+        assert result.success_count == 1
 
     def test_missing_file_raises(self):
         with pytest.raises(FileNotFoundError):
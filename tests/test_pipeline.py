@@ -1,9 +1,6 @@
 """Tests for the pipeline (end-to-end)."""
 
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import pytest
 
 from auto_coder.pipeline import run_pipeline, PipelineResult
 
@@ -11,38 +8,30 @@ from auto_coder.pipeline import run_pipeline, PipelineResult
 class TestPipeline:
     """End-to-end tests for the pipeline."""
 
-    def test_add_two_numbers(self):
-        result = run_pipeline(
-            task_description="Write a function add that adds two numbers",
-            test_call="add(2, 3)",
-        )
+    @pytest.mark.parametrize(
+        "task_description, test_call, expected",
+        [
+            ("Write a function add that adds two numbers", "add(2, 3)", 5),
+            ("Write a function sort_list that sorts a list", "sort_list([3, 1, 2])", [1, 2, 3]),
+            (
+                "Write a function factorial that computes the factorial of n",
+                "factorial(5)",
+                120,
+            ),
+            (
+                "Write a function is_palindrome that checks if a string is a palindrome",
+                "is_palindrome('racecar')",
+                True,
+            ),
+        ],
+        ids=["add", "sort_list", "factorial", "palindrome"],
+    )
+    def test_solves_task(self, task_description, test_call, expected):
+        result = run_pipeline(task_description=task_description, test_call=test_call)
         assert isinstance(result, PipelineResult)
         assert result.success is True
-        assert result.final_result.return_value == 5
-
-    def test_sort_list(self):
-        result = run_pipeline(
-            task_description="Write a function sort_list that sorts a list",
-            test_call="sort_list([3, 1, 2])",
-        )
-        assert result.success is True
-        assert result.final_result.return_value == [1, 2, 3]
-
-    def test_factorial(self):
-        result = run_pipeline(
-            task_description="Write a function factorial that computes the factorial of n",
-            test_call="factorial(5)",
-        )
-        assert result.success is True
-        assert result.final_result.return_value == 120
-
-    def test_palindrome(self):
-        result = run_pipeline(
-            task_description="Write a function is_palindrome that checks if a string is a palindrome",
-            test_call="is_palindrome('racecar')",
-        )
-        assert result.success is True
-        assert result.final_result.return_value is True
+        assert result.final_result.return_value == expected
+        assert type(result.final_result.return_value) is type(expected)
 
     def test_pipeline_tracks_iterations(self):
         result = run_pipeline(
@@ -60,3 +49,27 @@ class TestPipeline:
             max_iterations=2,
         )
         assert result.total_iterations <= 2
+
+    def test_stops_when_repair_has_no_effect(self):
+        # The failure is in the test call, so no repair can change it
+        result = run_pipeline(
+            task_description="Write a function sort_list that sorts a list",
+            test_call="sort_list(1 / 0)",
+            max_iterations=5,
+        )
+        assert result.success is False
+        assert result.total_iterations == 1
+        assert len(result.iterations) == 1
+
+    def test_stops_when_failure_repeats(self):
+        # The repair command changes the code, but the failure is in the
+        # test call and comes back unchanged
+        result = run_pipeline(
+            task_description="Write a function add that adds two numbers",
+            test_call="add(1, 2) / 0",
+            max_iterations=5,
+            repair_command="echo '# retried' >> {source_file}",
+        )
+        assert result.success is False
+        assert [record.repaired for record in result.iterations] == [True, False]
+        assert result.total_iterations == 2
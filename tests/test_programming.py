@@ -1,10 +1,5 @@
 """Tests for the programming stage."""
 
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
 from auto_coder.design import SolutionDesign
 from auto_coder.programming import generate_code, apply_patch
 
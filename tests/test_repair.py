@@ -1,11 +1,13 @@
 """Tests for the repair stage."""
 
-import sys
 import os
+import subprocess
 import tempfile
+import time
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+import pytest
 
+from auto_coder import repair as repair_module
 from auto_coder.diagnosis import Diagnosis
 from auto_coder.repair import repair_code, repair_code_with_cli, _build_issue_description
 
@@ -22,45 +24,77 @@ class TestRepairCode:
         result = repair_code("x = 1", diag)
         assert result == "x = 1"
 
-    def test_fixes_missing_colon(self):
+    @pytest.mark.parametrize(
+        "category, root_cause, source, expected",
+        [
+            ("syntax", "Syntax error", "def foo()\n    return 1", "def foo():"),
+            (
+                "reference",
+                "Variable or function 'x' is used but not defined",
+                "y = x + 1",
+                "x = None",
+            ),
+            ("arithmetic", "Division by zero encountered", "result = a / b", "== 0"),
+            ("key", "Dictionary key does not exist", "v = data['key']", ".get("),
+        ],
+        ids=["missing_colon", "name_error_variable", "division_by_zero", "key_error"],
+    )
+    def test_fixes_error(self, category, root_cause, source, expected):
         diag = Diagnosis(
-            error_category="syntax",
-            root_cause="Syntax error",
-            suggestion="Fix syntax",
+            error_category=category,
+            root_cause=root_cause,
+            suggestion="Fix it",
         )
-        source = "def foo()\n    return 1"
         result = repair_code(source, diag)
-        assert "def foo():" in result
+        assert expected in result
 
-    def test_fixes_name_error_variable(self):
+    def test_adds_missing_stdlib_import(self):
         diag = Diagnosis(
             error_category="reference",
-            root_cause="Variable or function 'x' is used but not defined",
-            suggestion="Define 'x'",
+            root_cause="Variable or function 'math' is used but not defined",
+            suggestion="Define 'math'",
         )
-        source = "y = x + 1"
+        source = '"""Demo."""\nroot = math.sqrt(16)'
         result = repair_code(source, diag)
-        assert "x = None" in result
+        assert result == '"""Demo."""\nimport math\nroot = math.sqrt(16)'
+
+    def test_no_import_for_attribute_error(self):
+        diag = Diagnosis(
+            error_category="reference",
+            root_cause="AttributeError: module 'math' has no attribute 'foo'",
+            suggestion="Check the attribute name",
+        )
+        result = repair_code("import math\nx = math.foo", diag)
+        assert result.count("import math") == 1
+
+    def test_no_duplicate_import(self):
+        diag = Diagnosis(
+            error_category="reference",
+            root_cause="Variable or function 'math' is used but not defined",
+            suggestion="Define 'math'",
+        )
+        result = repair_code("import math\ndel math\nx = math.pi", diag)
+        assert result.count("import math") == 1
 
-    def test_fixes_division_by_zero(self):
+    def test_syntax_repair_skipped_for_valid_source(self):
         diag = Diagnosis(
-            error_category="arithmetic",
-            root_cause="Division by zero encountered",
-            suggestion="Add a check for zero",
+            error_category="syntax",
+            root_cause="Syntax error in the code: invalid syntax",
+            suggestion="Fix syntax",
         )
-        source = "result = a / b"
+        source = "if ready: go()"
         result = repair_code(source, diag)
-        assert "== 0" in result
+        assert result == source
 
-    def test_fixes_key_error(self):
+    def test_rejects_repair_that_breaks_syntax(self):
         diag = Diagnosis(
-            error_category="key",
-            root_cause="Dictionary key does not exist",
-            suggestion="Use dict.get()",
+            error_category="index",
+            root_cause="List index is out of the valid range",
+            suggestion="Add bounds checking",
         )
-        source = "v = data['key']"
+        source = "values = [\n    items[i],\n]"
         result = repair_code(source, diag)
-        assert ".get(" in result
+        assert result == source
 
 
 class TestCliRepair:
@@ -160,6 +194,78 @@ class TestCliRepair:
         # CLI should NOT have been called since built-in worked
         assert "# cli_was_called" not in result
 
+    def test_cache_skips_repeated_cli_repair(self, tmp_path):
+        """A cached source/diagnosis pair should not invoke the CLI again."""
+        diag = Diagnosis(
+            error_category="unknown",
+            root_cause="mystery",
+            suggestion="investigate",
+        )
+        calls = tmp_path / "calls"
+        cmd = f"echo x >> {calls} && echo '# fixed' >> {{source_file}}"
+        cache = {}
+        first = repair_code("x = 1", diag, repair_command=cmd, cache=cache)
+        second = repair_code("x = 1", diag, repair_command=cmd, cache=cache)
+        assert first == second
+        assert "# fixed" in first
+        assert calls.read_text().count("x") == 1
+
+    @pytest.mark.skipif(not hasattr(os, "killpg"), reason="needs process groups")
+    def test_cli_timeout_kills_child_processes(self, tmp_path, monkeypatch):
+        """A timed-out command should not leave its children running."""
+        monkeypatch.setattr(repair_module, "CLI_REPAIR_TIMEOUT", 0.5)
+        diag = Diagnosis(
+            error_category="unknown",
+            root_cause="mystery",
+            suggestion="investigate",
+        )
+        pid_file = tmp_path / "pid"
+        cmd = f"sleep 30 & echo $! > {pid_file}; wait"
+        start = time.monotonic()
+        result = repair_code_with_cli("x = 1", diag, cmd)
+        assert result == "x = 1"
+        assert time.monotonic() - start < 10
+        pid = int(pid_file.read_text())
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail("child process survived the timeout")
+
+    def test_cli_interrupt_kills_child_processes(self, tmp_path, monkeypatch):
+        """An interrupted repair should not leave the command running."""
+        diag = Diagnosis(
+            error_category="unknown",
+            root_cause="mystery",
+            suggestion="investigate",
+        )
+        pid_file = tmp_path / "pid"
+        cmd = f"sleep 30 & echo $! > {pid_file}; wait"
+
+        def interrupted_communicate(proc, *args, **kwargs):
+            deadline = time.monotonic() + 5
+            while not pid_file.exists() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(subprocess.Popen, "communicate", interrupted_communicate)
+        with pytest.raises(KeyboardInterrupt):
+            repair_code_with_cli("x = 1", diag, cmd)
+        pid = int(pid_file.read_text())
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail("child process survived the interrupt")
+
     def test_cli_repair_cleans_up_temp_files(self):
         """Temp files should be cleaned up after CLI repair."""
         diag = Diagnosis(
@@ -173,6 +279,20 @@ class TestCliRepair:
         # Result should be the original since command didn't modify the file
         assert result == source
 
+    def test_cli_repair_removes_files_left_by_tool(self, tmp_path):
+        """The temp directory should be removed even if the tool adds files."""
+        diag = Diagnosis(
+            error_category="unknown",
+            root_cause="mystery",
+            suggestion="investigate",
+        )
+        record = tmp_path / "workdir"
+        cmd = f"dirname {{source_file}} > {record} && touch {{source_file}}.orig"
+        repair_code_with_cli("x = 1", diag, cmd)
+        workdir = record.read_text().strip()
+        assert workdir
+        assert not os.path.exists(workdir)
+
 
 class TestBuildIssueDescription:
     """Tests for _build_issue_description()."""
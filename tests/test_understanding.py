@@ -1,14 +1,19 @@
 """Tests for the understanding stage."""
 
-import sys
-import os
 import pytest
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
 from auto_coder.understanding import understand_task, TaskRequirements
 
 
+@pytest.fixture(scope="module")
+def detailed_requirements():
+    """Requirements parsed once from a description with every kind of detail."""
+    return understand_task(
+        "A function that takes a list of numbers, returns the sum of all "
+        "elements, must handle negative numbers"
+    )
+
+
 class TestUnderstandTask:
     """Tests for understand_task()."""
 
@@ -34,14 +39,6 @@ class TestUnderstandTask:
         req = understand_task("sort a list of integers")
         assert req.function_name != ""
 
-    def test_extracts_inputs(self):
-        req = understand_task("A function that takes a list of numbers")
-        assert len(req.inputs) > 0
-
-    def test_extracts_outputs(self):
-        req = understand_task("Returns the sum of all elements")
-        assert len(req.outputs) > 0
-
-    def test_extracts_constraints(self):
-        req = understand_task("Must handle negative numbers")
-        assert len(req.constraints) > 0
+    @pytest.mark.parametrize("attribute", ["inputs", "outputs", "constraints"])
+    def test_extracts_details(self, detailed_requirements, attribute):
+        assert len(getattr(detailed_requirements, attribute)) > 0